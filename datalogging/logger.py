@@ -1,4 +1,15 @@
-from typing import Dict, Tuple, Any, Iterable, Union
+import sys
+from array import array
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Dict, Tuple, Any, Callable, Optional, Union
+
+Leaf = Union[list, array]
+
+# types of values that are known to be logged via extend or append respectively, so the more expensive check for
+# a non-None `__iter__` can be skipped for the common cases
+_EXTEND_TYPES = frozenset((list, tuple, range, array))
+_APPEND_TYPES = frozenset((int, float, bool, complex, type(None)))
 
 
 def _split_vpath(vpath: str) -> Tuple[str, str]:
@@ -10,8 +21,8 @@ def _split_vpath(vpath: str) -> Tuple[str, str]:
     >>> _split_vpath('foo/bar/baz')
     ('foo', 'bar/baz')
     """
-    paths = vpath.split('/', 1)
-    return tuple(paths) if len(paths) == 2 else (paths[0], '')
+    i = vpath.find('/')
+    return (vpath, '') if i < 0 else (vpath[:i], vpath[i + 1:])
 
 
 def _rsplit_vpath(vpath: str) -> Tuple[str, str]:
@@ -23,29 +34,131 @@ def _rsplit_vpath(vpath: str) -> Tuple[str, str]:
     >>> _rsplit_vpath('foo/bar/baz')
     ('foo/bar', 'baz')
     """
-    paths = vpath.rsplit('/', 1)
-    return tuple(paths) if len(paths) == 2 else ('', paths[0])
+    i = vpath.rfind('/')
+    return ('', vpath) if i < 0 else (vpath[:i], vpath[i + 1:])
+
+
+@lru_cache(maxsize=4096)
+def _parse_vpath(vpath: str) -> Tuple[Tuple[str, ...], str, str]:
+    """splits a virtual path into its keys, its directory path and its data key.
+
+    Results are cached, as the same few vpaths tend to be used over and over again. All keys are interned, so dict
+    lookups with them mostly boil down to identity comparisons.
+
+    >>> _parse_vpath('foo/bar/baz')
+    (('foo', 'bar', 'baz'), 'foo/bar', 'baz')
+    """
+    keys = tuple(sys.intern(key) for key in vpath.split('/'))
+    dir_path, _ = _rsplit_vpath(vpath)
+    return keys, sys.intern(dir_path), keys[-1]
+
+
+class _ChildDict(dict):
+    """dict of child nodes, creating and inserting a new node on access of a missing key."""
+    __slots__ = ()
+
+    def __missing__(self, key: str) -> 'LogNode':
+        node = self[key] = LogNode()
+        return node
 
 
 class LogNode:
+    __slots__ = ('data', 'children', 'typecodes')
+
     def __init__(self, data: Dict[str, list] = None, children: Dict[str, 'LogNode'] = None):
         self.data = data or {}
-        self.children = children or {}
+        # other mappings are copied into a _ChildDict, which creates missing children on access
+        self.children = children if isinstance(children, _ChildDict) else _ChildDict(children or ())
+        # typecodes of the data keys stored in arrays, surviving clearing so the arrays get recreated on the next log
+        self.typecodes: Optional[Dict[str, str]] = None
+
+    def leaf(self, key: str) -> Leaf:
+        """Get the data at key, creating an empty list (or array, if one was made at key before) if necessary."""
+        lst = self.data.get(key)
+        if lst is None:
+            typecode = self.typecodes.get(key) if self.typecodes else None
+            lst = self.data[key] = [] if typecode is None else array(typecode)
+        return lst
 
     def clear(self):
         for child in self.children.values():
             child.clear()
         self.data = {}
 
+    def is_empty(self) -> bool:
+        """Whether neither this node nor any node below it holds data."""
+        if self.data:
+            return False
+        if not self.children:
+            return True
+        stack = list(self.children.values())
+        while stack:
+            node = stack.pop()
+            if node.data:
+                return False
+            stack.extend(node.children.values())
+        return True
+
     def parse(self):
+        """Parse the tree below this node into nested dictionaries, omitting empty children.
+
+        Walks the tree iteratively in post-order, so deep trees neither hit the recursion limit nor pay for a Python
+        frame per node.
+        """
+        if not self.children:
+            return dict(self.data)
         result = dict(self.data)
-        for key, child in self.children.items():
-            parsed = child.parse()
-            if parsed:
-                result[key] = parsed
+        stack = [(iter(self.children.items()), result, None, None)]
+        while stack:
+            items, current, parent, parent_key = stack[-1]
+            for key, child in items:
+                if child.children:
+                    stack.append((iter(child.children.items()), dict(child.data), current, key))
+                    break
+                if child.data:
+                    current[key] = dict(child.data)
+            else:
+                stack.pop()
+                if parent is not None and current:
+                    parent[parent_key] = current
         return result
 
 
+class _LogNodeView(Mapping):
+    """read-only, live view of the tree below a node, looking like the nested dictionaries of :meth:`LogNode.parse`."""
+    __slots__ = ('_node',)
+
+    def __init__(self, node: LogNode):
+        self._node = node
+
+    def __getitem__(self, key: str):
+        child = self._node.children.get(key)
+        if child is not None and not child.is_empty():
+            return _LogNodeView(child)
+        return self._node.data[key]
+
+    def __iter__(self):
+        data = self._node.data
+        yield from data
+        for key, child in self._node.children.items():
+            if key not in data and not child.is_empty():
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        # comparing needs the whole tree anyway, which parsing it walks in a single pass
+        if isinstance(other, _LogNodeView):
+            return self._node.parse() == other._node.parse()
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self._node.parse() == other
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self._node.parse()!r})'
+
+
 class Logger:
     """in-memory logger for diverse data.
 
@@ -54,17 +167,18 @@ class Logger:
     """
     def __init__(self, root: LogNode = None):
         self._root = root or LogNode()
+        # flat index of the leaves accessed via this logger: vpath -> (node, data key). The data itself is always looked
+        # up in the node, so the index neither holds on to cleared data nor goes stale if the data gets replaced.
+        self._leaves: Dict[str, Tuple[LogNode, str]] = {}
 
     def __contains__(self, vpath: str) -> bool:
         if vpath == '':
             return True
-        current_node = self._root
-        *dir_keys, last_key = vpath.split('/')
-        for key in dir_keys:
-            current_children = current_node.children
-            if key not in current_children:
-                return False
-            current_node = current_children[key]
+        _, dir_path, last_key = _parse_vpath(vpath)
+        try:
+            current_node = self._traverse(dir_path)
+        except KeyError:
+            return False
         return last_key in current_node.children or last_key in current_node.data
 
     def _traverse(self, vpath: str, create: bool = False) -> LogNode:
@@ -74,19 +188,18 @@ class Logger:
         """
         if vpath == '':
             return self._root
-        if not create and vpath not in self:
-            raise KeyError(f'vpath {vpath} does not exist.')
+        keys = _parse_vpath(vpath)[0]
         current_node = self._root
-        for key in vpath.split('/'):
-            current_node = current_node.children.setdefault(key, LogNode())
+        if create:
+            for key in keys:
+                current_node = current_node.children[key]
+        else:
+            for key in keys:
+                current_node = current_node.children.get(key)
+                if current_node is None:
+                    raise KeyError(f'vpath {vpath} does not exist.')
         return current_node
 
-    def _do_data_op(self, vpath, op, create: bool = False, *args, **kwargs):
-        dir_path, data_key = _rsplit_vpath(vpath)
-        node_data = self._traverse(dir_path, create).data
-        lst = node_data.setdefault(data_key, []) if create else node_data[data_key]
-        return op(lst, *args, **kwargs)
-
     def make_child(self, vpath: str) -> 'Logger':
         """Get a logger at the given vpath, relativ so the logger the mathod was called from.
 
@@ -95,25 +208,98 @@ class Logger:
         """
         return self.__class__(self._traverse(vpath, create=True))
 
-    def __getitem__(self, vpath: str) -> list:
+    def make_array(self, vpath: str, typecode: str = 'd') -> array:
+        """Create a typed `array.array` container at vpath and return a reference to it.
+
+        Values logged to vpath afterwards are stored unboxed in the array, which takes considerably less memory than a
+        list for long numeric streams (e.g. 8 instead of ~32 bytes per float). The typecode is remembered, so after
+        clearing, a new array is created at vpath on the next log.
+
+        Raises:
+            ValueError -- Data at vpath does already exist.
+        """
+        _, dir_path, data_key = _parse_vpath(vpath)
+        node = self._traverse(dir_path, create=True)
+        if data_key in node.data:
+            raise ValueError(f'vpath {vpath} does already exist.')
+        arr = array(typecode)
+        if node.typecodes is None:
+            node.typecodes = {}
+        node.typecodes[data_key] = typecode
+        node.data[data_key] = arr
+        return arr
+
+    def __getitem__(self, vpath: str) -> Leaf:
         """Return a reference to the data at vpath."""
-        return self._do_data_op(vpath, lambda lst: lst)
+        entry = self._leaves.get(vpath)
+        if entry is None:
+            _, dir_path, data_key = _parse_vpath(vpath)
+            node = self._traverse(dir_path)
+            lst = node.data[data_key]
+            self._leaves[vpath] = node, data_key
+            return lst
+        node, data_key = entry
+        return node.data[data_key]
+
+    def resolve(self, vpath: str) -> Leaf:
+        """Return a reference to the data at vpath, creating an empty list if it does not exist yet.
+
+        Useful for bulk ingestion, e.g. extending an array created via :meth:`make_array` directly by another
+        `array.array` of the same typecode, which copies the raw buffer instead of iterating over the values.
+        """
+        node, data_key = self._resolve_node(vpath)
+        return node.leaf(data_key)
 
-    def get(self, vpath: str, default=None) -> list:
+    def bind(self, vpath: str, extend: bool = False) -> Callable[[Any], None]:
+        """Return a function logging single values (or iterables of values if extend is set) at vpath.
+
+        The returned function is the bound `append`/`extend` method of the data at vpath, so calling it does not go
+        through any Python-level logger code at all. As it references the data directly, it has to be bound again
+        after the data was cleared.
+        """
+        lst = self.resolve(vpath)
+        return lst.extend if extend else lst.append
+
+    def get(self, vpath: str, default=None) -> Leaf:
         """Return a reference to the data at vpath if it exists, else return the provided default."""
-        if vpath in self:
+        try:
             node_or_list = self[vpath]
-            if isinstance(node_or_list, list):
-                return node_or_list
-        return default
+        except KeyError:
+            return default
+        return node_or_list if isinstance(node_or_list, (list, array)) else default
 
     def _log_vpaths_vals(self, vpath_vals_dict: Dict[str, Any]):
         for vpath, val in vpath_vals_dict.items():
-            self._do_data_op(vpath, list.extend if isinstance(val, Iterable) else list.append, True, val)
+            self.log_one(vpath, val)
+
+    def _resolve_node(self, vpath: str) -> Tuple[LogNode, str]:
+        """Get the node holding the data at vpath and the data key, creating the node if it does not exist yet."""
+        _, dir_path, data_key = _parse_vpath(vpath)
+        return self._traverse(dir_path, create=True), data_key
+
+    def log_one(self, vpath: str, value: Any):
+        """Logs a single value (or iterable of values) at vpath.
+
+        Same as calling `log(vpath, value)`, but without the generic dispatch of :meth:`log`.
+        """
+        entry = self._leaves.get(vpath)
+        if entry is None:
+            entry = self._leaves[vpath] = self._resolve_node(vpath)
+        node, data_key = entry
+        lst = node.data.get(data_key)
+        if lst is None:
+            lst = node.leaf(data_key)
+        value_type = type(value)
+        if value_type in _EXTEND_TYPES or (value_type not in _APPEND_TYPES and getattr(value_type, '__iter__', None) is not None):
+            lst.extend(value)
+        else:
+            lst.append(value)
 
     def log(self, *args):
         """Logs data in-memory to a list container, associated with a unix-path-like key.
 
+        Data is appended to an `array.array` instead, if one was created at the vpath via :meth:`make_array`.
+
         Args:
             **either**
             vpath (str): Virtual path
@@ -125,8 +311,10 @@ class Logger:
             TypeError -- Wrong number of arguments.
         """
         len_ = len(args)
-        if 1 <= len_ <= 2:
-            self._log_vpaths_vals(args[0] if len_ == 1 else {args[0]: args[1]})
+        if len_ == 2:
+            self.log_one(*args)
+        elif len_ == 1:
+            self._log_vpaths_vals(args[0])
         else:
             raise TypeError("Method has to be called with either one or two arguments.")
 
@@ -137,3 +325,13 @@ class Logger:
     def as_dict(self):
         """Parses the underlying tree-structure of data into nested dictionaries."""
         return self._root.parse()
+
+    def view(self) -> Mapping:
+        """Get a read-only view of the underlying tree-structure of data, mapping like the result of :meth:`as_dict`.
+
+        Other than :meth:`as_dict` no dictionaries are built, which makes it cheap to get for repeated inspection. The
+        view is live, so it reflects data logged after it was created. Each key access and iteration checks whether the
+        child subtrees hold any data though, so iterating over the whole view level by level is slower than a single
+        call of :meth:`as_dict`; comparisons parse the tree just like :meth:`as_dict`.
+        """
+        return _LogNodeView(self._root)
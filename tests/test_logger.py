@@ -1,6 +1,14 @@
+import sys
+import weakref
+from array import array
+
 import pytest
 
-from datalogging.logger import LogNode, Logger, _split_vpath, _rsplit_vpath
+from datalogging.logger import LogNode, Logger, _split_vpath, _rsplit_vpath, _parse_vpath
+
+
+class WeakrefableList(list):
+    """list that can be weakly referenced, for checking whether data is still referenced somewhere."""
 
 
 def test_split_vpath():
@@ -17,6 +25,17 @@ def test_rsplit_vpath():
     assert _rsplit_vpath('asdf/qwer/yxcv') == ('asdf/qwer', 'yxcv')
 
 
+def test_parse_vpath():
+    assert _parse_vpath('asdf') == (('asdf',), '', 'asdf')
+    assert _parse_vpath('asdf/qwer') == (('asdf', 'qwer'), 'asdf', 'qwer')
+    assert _parse_vpath('asdf/qwer/yxcv') == (('asdf', 'qwer', 'yxcv'), 'asdf/qwer', 'yxcv')
+    assert _parse_vpath('asdf/qwer') is _parse_vpath('asdf/qwer')
+    keys, dir_path, data_key = _parse_vpath('asdf/qwer/' + 'yxcv')
+    assert all(key is sys.intern(key) for key in keys)
+    assert dir_path is sys.intern('asdf/qwer')
+    assert data_key is sys.intern('yxcv')
+
+
 class TestLogNode:
     @pytest.fixture()
     def node(self):
@@ -26,6 +45,15 @@ class TestLogNode:
     def child_node(self, node):
         return node.children.setdefault('child', LogNode())
 
+    def test_accessing_missing_child_creates_it(self, node):
+        child = node.children['child']
+        assert isinstance(child, LogNode)
+        assert node.children['child'] is child
+
+    def test_children_of_type_childdict_are_kept(self, node):
+        children = type(node.children)()
+        assert LogNode(children=children).children is children
+
     def test_clearing_empties_data_dict(self, node):
         node.data['vals'] = [1]
         node.clear()
@@ -44,6 +72,21 @@ class TestLogNode:
         assert 'child' in node.children
         assert node.parse() == {}
 
+    def test_node_without_data_in_tree_is_empty(self, node, child_node):
+        assert node.is_empty()
+        child_node.data['vals'] = [1]
+        assert not node.is_empty()
+
+    def test_parsing_deep_tree_does_not_recurse(self, node):
+        current = node
+        for _ in range(5000):
+            current = current.children.setdefault('child', LogNode())
+        current.data['vals'] = [1]
+        parsed = node.parse()
+        for _ in range(5000):
+            parsed = parsed['child']
+        assert parsed == {'vals': [1]}
+
 
 class TestLogger:
     @pytest.fixture()
@@ -59,6 +102,13 @@ class TestLogger:
         child_logger = logger.make_child(vpath)
         assert child_logger._root == logger._traverse(vpath)
 
+    def test_failed_lookups_do_not_create_nodes(self, logger):
+        assert 'a/b' not in logger
+        assert logger.get('a/b/c') is None
+        with pytest.raises(KeyError):
+            _ = logger['a/b/c']
+        assert logger._root.children == {}
+
     def test_getitem_returns_correct_data(self, logger, child_logger):
         child_logger._root.data['vals'] = [1]
         assert logger['child/vals'] == [1]
@@ -69,6 +119,23 @@ class TestLogger:
         assert id(logger['child/vals']) == id(ref)
         assert id(child_logger['vals']) == id(ref)
 
+    def test_getitem_returns_replaced_data(self, logger, child_logger):
+        child_logger._root.data['vals'] = [1]
+        assert logger['child/vals'] == [1]
+        child_logger._root.data['vals'] = ref = [2]
+        assert logger['child/vals'] is ref
+        logger.clear()
+        with pytest.raises(KeyError):
+            _ = logger['child/vals']
+
+    def test_cleared_data_read_before_is_not_referenced_anymore(self, logger, child_logger):
+        child_logger._root.data['vals'] = WeakrefableList([1])
+        ref = weakref.ref(child_logger._root.data['vals'])
+        assert logger['child/vals'] is ref()
+        assert logger.get('child/vals') is ref()
+        logger.clear()
+        assert ref() is None
+
     def test_getitem_raises_keyerror_for_invalid_datakey(self, logger, child_logger):
         # root node should not have data entry with empty key
         with pytest.raises(KeyError):
@@ -83,6 +150,29 @@ class TestLogger:
         with pytest.raises(KeyError):
             _ = logger['child/nonexistent']
 
+    def test_resolve_creates_missing_data(self, logger, child_logger):
+        lst = logger.resolve('child/vals')
+        assert lst == []
+        assert child_logger['vals'] is lst
+
+    def test_resolve_returns_reference_to_existing_data(self, logger):
+        arr = logger.make_array('vals')
+        logger.resolve('vals').extend(array('d', [1, 2]))
+        assert logger['vals'] is arr
+        assert arr == array('d', [1, 2])
+
+    def test_bound_function_logs_at_vpath(self, logger, child_logger):
+        push = logger.bind('child/vals')
+        push(1)
+        push([2])
+        assert child_logger.get('vals') == [1, [2]]
+
+    def test_bound_extending_function_logs_multiple_values_at_vpath(self, logger):
+        logger.log('vals', 1)
+        push = logger.bind('vals', extend=True)
+        push([2, 3])
+        assert logger.get('vals') == [1, 2, 3]
+
     def test_get_returns_correct_existing_item(self, logger, child_logger):
         child_logger._root.data['vals'] = [1]
         assert logger.get('child/vals') == logger['child/vals']
@@ -93,6 +183,8 @@ class TestLogger:
         assert child_logger.get('vals') is None
         assert logger.get('child/vals', [2]) == [2]
         assert child_logger.get('vals', [3]) == [3]
+        assert logger.get('') is None
+        assert logger.get('child') is None
 
     def test_logging_single_value_appends_it_to_data(self, logger):
         logger.log('vals', 1)
@@ -114,6 +206,63 @@ class TestLogger:
         logger.log('vals', [4, 5, 6])
         assert logger.get('vals') == [1, 2, 3, 4, 5, 6]
 
+    def test_logging_generic_iterable_extends_data(self, logger):
+        logger.log('vals', (i for i in range(3)))
+        logger.log('vals', {3})
+        assert logger.get('vals') == [0, 1, 2, 3]
+
+    def test_logging_non_iterable_object_appends_it_to_data(self, logger):
+        class NotIterable:
+            __iter__ = None
+
+        obj, not_iterable = object(), NotIterable()
+        logger.log('vals', obj)
+        logger.log('vals', not_iterable)
+        assert logger.get('vals') == [obj, not_iterable]
+
+    def test_log_one_equals_log(self, logger, child_logger):
+        logger.log_one('child/vals', 1)
+        logger.log_one('child/vals', [2, 3])
+        assert child_logger.get('vals') == [1, 2, 3]
+
+    def test_logging_mapping_logs_all_values(self, logger):
+        logger.log({'vals': 1, 'child/vals': [2, 3]})
+        assert logger.as_dict() == {'vals': [1], 'child': {'vals': [2, 3]}}
+
+    def test_logging_with_wrong_number_of_arguments_raises_typeerror(self, logger):
+        with pytest.raises(TypeError):
+            logger.log()
+        with pytest.raises(TypeError):
+            logger.log('vals', 1, 2)
+
+    def test_logging_to_array_stores_values_in_array(self, logger):
+        arr = logger.make_array('child/vals')
+        logger.log('child/vals', 1)
+        logger.log('child/vals', [2, 3])
+        logger.log({'child/vals': 4.5})
+        assert logger['child/vals'] is arr
+        assert logger.get('child/vals') == array('d', [1, 2, 3, 4.5])
+        assert logger.as_dict() == {'child': {'vals': array('d', [1, 2, 3, 4.5])}}
+
+    def test_logging_to_array_after_clearing_recreates_array(self, logger, child_logger):
+        child_logger.make_array('vals', 'i')
+        logger.clear()
+        logger.log('child/vals', 1)
+        assert logger['child/vals'] == array('i', [1])
+        logger.clear()
+        assert child_logger.resolve('vals') == array('i')
+
+    def test_making_array_with_invalid_typecode_keeps_vpath_usable(self, logger):
+        with pytest.raises(ValueError):
+            logger.make_array('vals', 'z')
+        logger.log('vals', 1)
+        assert logger['vals'] == [1]
+
+    def test_making_array_at_existing_vpath_raises_valueerror(self, logger):
+        logger.log('vals', 1)
+        with pytest.raises(ValueError):
+            logger.make_array('vals')
+
     def test_as_dict(self, logger, child_logger):
         assert logger.as_dict() == {}
         assert child_logger.as_dict() == {}
@@ -126,11 +275,53 @@ class TestLogger:
         assert logger.as_dict() == {'vals': [1], 'child': {'vals': [2]}}
         assert child_logger.as_dict() == {'vals': [2]}
 
+    def test_view_equals_as_dict(self, logger, child_logger):
+        assert logger.view() == {}
+        logger.make_child('empty/child')
+        logger.log('vals', 1)
+        logger.log('child/vals', 2)
+        assert logger.view() == logger.as_dict()
+        assert child_logger.view() == child_logger.as_dict()
+        assert list(logger.view()) == list(logger.as_dict())
+        assert logger.as_dict() == logger.view()
+        assert logger.view()['child'] == child_logger.view()
+        assert logger.view() != [('vals', [1])]
+
+    def test_view_reflects_later_changes(self, logger):
+        view = logger.view()
+        logger.log('child/vals', 1)
+        assert view['child']['vals'] == [1]
+        logger.clear()
+        assert len(view) == 0
+        with pytest.raises(KeyError):
+            _ = view['child']
+
     def test_clear_parent_removes_data_from_child(self, logger, child_logger):
         child_logger.log('vals', 1)
         logger.clear()
         assert child_logger.as_dict() == {}
 
+    def test_logging_after_clearing_parent_is_visible_in_parent(self, logger, child_logger):
+        child_logger.log('vals', 1)
+        logger.clear()
+        child_logger.log('vals', 2)
+        assert logger.as_dict() == {'child': {'vals': [2]}}
+
+    def test_cleared_data_is_not_referenced_anymore(self, logger, child_logger):
+        child_logger._root.data['vals'] = WeakrefableList()
+        ref = weakref.ref(child_logger._root.data['vals'])
+        child_logger.log('vals', 1)
+        logger.log('child/vals', 2)
+        assert ref() == [1, 2]
+        logger.clear()
+        assert ref() is None
+
+    def test_logging_after_replacing_data_logs_to_new_data(self, logger):
+        logger.log('vals', 1)
+        logger._root.data['vals'] = ref = []
+        logger.log('vals', 2)
+        assert ref == [2]
+
     def test_clear_child_does_not_remove_data_from_parent(self, logger, child_logger):
         logger.log('vals', 1)
         child_logger.clear()